@@ -21,105 +21,281 @@
 # (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-from typing import cast, Dict, List, Optional, Tuple
+import functools
+import os
+import pickle
+import sys
+from typing import cast, AbstractSet, Dict, Iterator, List, Optional, Set, Tuple
 
-def parse_hershey_font(filename: str) -> Dict[int, Dict[str, object]]:
+import numpy as np
+
+# Bump whenever the structure returned by parse_hershey_font() changes, so that
+# stale font caches are ignored rather than loaded.
+FONT_CACHE_VERSION: int = 7
+
+# Coordinates are stored as characters relative to 'R', and a pen up operation
+# is a space followed by 'R'
+ORIGIN: int = ord('R')
+PENUP_X: int = ord(' ') - ORIGIN
+
+# Translation table taking each character of the font data to its coordinate
+# relative to 'R', stored as a signed byte
+COORD_TABLE: bytes = bytes((i - ORIGIN) & 0xFF for i in range(256))
+
+
+def decode_coordinates(data: bytes, spans: List[Tuple[int, int, int]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[int]]:
+    """
+    Decode the coordinate characters of a run of glyphs into arrays shared by all of them.
+
+    Args:
+        data (bytes): Contents of the font file
+        spans (list): (start, end, number of coordinate pairs) for each glyph, where start
+            and end are the offsets of its coordinate characters; line breaks in between
+            are skipped
+
+    Returns:
+        tuple: int8 arrays of the x and y coordinates relative to 'R', a boolean array
+        marking the pen up operations, and the offsets into those arrays at which each
+        glyph starts (with the total length appended)
+    """
+    chunks: List[bytes] = []
+    offsets: List[int] = [0]
+    for start, end, num_pairs in spans:
+        # Collect all coordinate data (continuation lines contain only coordinate data, no
+        # header) and convert the characters to coordinates relative to 'R' in one pass
+        coord_data: bytes = data[start:end].translate(COORD_TABLE, b'\n')
+
+        # Keep exactly num_pairs coordinate pairs (none for a header claiming no vertices)
+        num_pairs = max(0, min(num_pairs, len(coord_data) // 2))
+        chunks.append(coord_data[:num_pairs * 2])
+        offsets.append(offsets[-1] + num_pairs)
+
+    coordinates: np.ndarray = np.frombuffer(b''.join(chunks), dtype=np.int8).reshape(-1, 2)
+    xs: np.ndarray = coordinates[:, 0].copy()
+    ys: np.ndarray = coordinates[:, 1].copy()
+
+    # Pen up operations are a space followed by 'R'
+    penup: np.ndarray = (xs == PENUP_X) & (ys == 0)
+
+    return xs, ys, penup, offsets
+
+
+# Where a glyph lives in HersheyGlyphs: (left, right, first row, end row)
+GlyphRecord = Tuple[int, int, int, int]
+
+
+class HersheyGlyphs:
+    """
+    Glyph definitions of a font, backed by coordinate arrays shared by all glyphs.
+
+    The coordinates of every glyph are stored one after another in the xs, ys and
+    penup arrays, and records maps each glyph number to a GlyphRecord giving its
+    rows in them.  Looking a glyph up returns a dictionary of views into the shared
+    arrays, so nothing is copied per glyph and a whole string can be gathered and
+    transformed at once (see text_polylines()).
+
+    Args:
+        xs (ndarray): x coordinates of all glyphs
+        ys (ndarray): y coordinates of all glyphs
+        penup (ndarray): Pen up mask of all glyphs
+        records (dict): GlyphRecord for each glyph number
     """
-    Parse a Hershey font file and return a dictionary of glyph definitions.
+
+    def __init__(self, xs: np.ndarray, ys: np.ndarray, penup: np.ndarray, records: Dict[int, GlyphRecord]) -> None:
+        self.xs: np.ndarray = xs
+        self.ys: np.ndarray = ys
+        self.penup: np.ndarray = penup
+        self.records: Dict[int, GlyphRecord] = records
+
+    def __contains__(self, glyph_num: object) -> bool:
+        return glyph_num in self.records
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.records)
+
+    def record(self, glyph_num: int) -> GlyphRecord:
+        return self.records[glyph_num]
+
+    def __getitem__(self, glyph_num: int) -> Dict[str, object]:
+        left_pos, right_pos, start, end = self.records[glyph_num]
+        return {
+            'left': left_pos,
+            'right': right_pos,
+            'xs': self.xs[start:end],
+            'ys': self.ys[start:end],
+            'penup': self.penup[start:end]
+        }
+
+
+def parse_hershey_font(filename: str, needed: Optional[AbstractSet[int]] = None) -> HersheyGlyphs:
+    """
+    Parse a Hershey font file and return its glyph definitions.
 
     Args:
         filename (str): Path to the Hershey font file
+        needed (set): If given, only these glyph numbers are kept and the rest are skipped
 
     Returns:
-        dict: Dictionary where keys are glyph numbers and values are dictionaries containing:
+        HersheyGlyphs: Glyph definitions, where looking up a glyph number gives a dictionary containing:
             - 'left': left hand position
             - 'right': right hand position
-            - 'coordinates': list of (x, y) tuples with None indicating pen up operations
+            - 'xs': int8 array of x coordinates
+            - 'ys': int8 array of y coordinates
+            - 'penup': boolean array marking the entries that are pen up operations
     """
-    glyphs: Dict[int, Dict[str, object]] = {}
+    with open(filename, 'rb') as file:
+        data: bytes = file.read()
 
-    with open(filename, 'r') as file:
-        lines: List[str] = [line.rstrip('\n\r') for line in file]  # Read all lines and remove line endings
+    if b'\r' in data:
+        data = data.replace(b'\r', b'')
+
+    # Glyph number, left and right positions of each glyph, and where its coordinates are
+    headers: List[Tuple[int, int, int]] = []
+    spans: List[Tuple[int, int, int]] = []
+
+    # Local bindings for the loop below, which runs once per glyph
+    find = data.find
+    size: int = len(data)
+    origin: int = ORIGIN
 
-    i: int = 0
-    while i < len(lines):
-        line: str = lines[i]
+    pos: int = 0
+    while pos < size:
+        eol: int = find(b'\n', pos)
+        if eol < 0:
+            eol = size
 
-        if len(line) < 10:  # Skip lines that are too short
-            i += 1
+        if eol - pos < 10:  # Skip lines that are too short
+            pos = eol + 1
             continue
 
         try:
             # Parse glyph number (columns 0:4, right-justified)
-            glyph_num: int = int(line[0:5].strip())
+            glyph_num: int = int(data[pos:pos + 5])
 
             # Parse number of vertices (columns 5:7)
-            num_vertices: int = int(line[5:8])
+            num_vertices: int = int(data[pos + 5:pos + 8])
 
-            # Parse left and right positions (columns 8 and 9)
-            left_char: str = line[8]
-            right_char: str = line[9]
-            left_pos: int = ord(left_char) - ord('R')
-            right_pos: int = ord(right_char) - ord('R')
-
-            # Collect all coordinate data, potentially from multiple lines
-            coord_data: str = line[10:]  # Start with data from first line
-
-            # The number of coordinate pairs we need (num_vertices includes left/right positions)
-            target_pairs: int = num_vertices - 1
-
-            line_idx: int = i
-            # Continue reading lines until we have enough character pairs for all coordinates
-            while len(coord_data) < target_pairs * 2 and line_idx + 1 < len(lines):
-                line_idx += 1
-                # Continuation lines contain only coordinate data (no header)
-                coord_data += lines[line_idx]
-
-            # Debug output for troubleshooting
-            # print(f"Glyph {glyph_num}: target_pairs={target_pairs}, coord_data_len={len(coord_data)}, coord_data='{coord_data}'")
-
-            # Now process all the coordinate data
-            coordinates: List[Optional[Tuple[int, int]]] = []
-            j: int = 0
-
-            # Process exactly target_pairs coordinate pairs
-            while j < len(coord_data) - 1 and len(coordinates) < target_pairs:
-                x_char: str = coord_data[j]
-                y_char: str = coord_data[j + 1]
-
-                # Check for pen up operation (space followed by 'R')
-                if x_char == ' ' and y_char == 'R':
-                    coordinates.append(None)
-                else:
-                    # Convert characters to coordinates relative to 'R'
-                    x: int = ord(x_char) - ord('R')
-                    y: int = ord(y_char) - ord('R')
-                    coordinates.append((x, y))
-
-                j += 2
-
-            # Store the glyph data
-            glyphs[glyph_num] = {
-                'left': left_pos,
-                'right': right_pos,
-                'coordinates': coordinates
-            }
-
-            # Move to the line after all the data for this glyph
-            i = line_idx + 1
-
-        except (ValueError, IndexError) as e:
+        except ValueError:
             # Skip malformed lines
-            print(f"Warning: Skipping malformed line: {line[:20]}...")
-            i += 1
+            print(f"Warning: Skipping malformed line: {data[pos:min(eol, pos + 20)].decode('latin1')}...")
+            pos = eol + 1
             continue
 
+        # The number of coordinate pairs we need (num_vertices includes left/right positions)
+        target_pairs: int = num_vertices - 1
+
+        # Skip over continuation lines until they hold enough character pairs for all coordinates
+        data_len: int = eol - pos - 10
+        end: int = eol
+        while data_len < target_pairs * 2 and end + 1 < size:
+            next_eol: int = find(b'\n', end + 1)
+            if next_eol < 0:
+                next_eol = size
+            data_len += next_eol - end - 1
+            end = next_eol
+
+        if needed is None or glyph_num in needed:
+            # Parse left and right positions (columns 8 and 9)
+            headers.append((glyph_num, data[pos + 8] - origin, data[pos + 9] - origin))
+            spans.append((pos + 10, end, target_pairs))
+
+        # Move to the line after all the data for this glyph
+        pos = end + 1
+
+    # Decode all the coordinates at once and give each glyph its rows
+    xs, ys, penup, offsets = decode_coordinates(data, spans)
+    records: Dict[int, GlyphRecord] = {}
+    for i, (glyph_num, left_pos, right_pos) in enumerate(headers):
+        records[glyph_num] = (left_pos, right_pos, offsets[i], offsets[i + 1])
+
+    return HersheyGlyphs(xs, ys, penup, records)
+
+
+def file_signature(filename: str) -> Tuple[int, int]:
+    """
+    Return the modification time (in nanoseconds) and size of a file, used to tell when
+    anything derived from the file is stale.
+
+    Args:
+        filename (str): Path to the file
+
+    Returns:
+        tuple: (modification time, size)
+    """
+    st: os.stat_result = os.stat(filename)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def load_hershey_font(filename: str, cache: bool = True) -> HersheyGlyphs:
+    """
+    Load a Hershey font file, reusing previously parsed glyphs if possible.
+
+    The parsed glyphs are kept next to the font file as <filename>.pkl, along with
+    the signature of the font file they came from.  The sidecar is used as long as
+    that signature still matches, otherwise the font is parsed again and the sidecar
+    is rewritten.  Failing to read or write the sidecar is not an error, the font is
+    simply parsed.
+
+    Within a process, loading an unchanged font file again returns the same
+    HersheyGlyphs object without touching the sidecar at all.  That object and its
+    xs, ys and penup arrays are shared, so they must not be modified.
+
+    Args:
+        filename (str): Path to the Hershey font file
+        cache (bool): Whether to read and write the sidecar file
+
+    Returns:
+        HersheyGlyphs: Glyph definitions, as returned by parse_hershey_font()
+    """
+    return cached_hershey_font(os.path.abspath(filename), file_signature(filename), cache)
+
+
+@functools.lru_cache(maxsize=4)
+def cached_hershey_font(filename: str, signature: Tuple[int, int], cache: bool) -> HersheyGlyphs:
+    """
+    Memoized body of load_hershey_font(), keyed by the font file signature.
+    """
+    cache_name: str = filename + '.pkl'
+
+    if cache:
+        try:
+            with open(cache_name, 'rb') as file:
+                version, cached_signature, xs, ys, penup, records = pickle.load(file)
+            if version == FONT_CACHE_VERSION and cached_signature == signature:
+                return HersheyGlyphs(xs, ys, penup, records)
+        except Exception:
+            # A missing, unreadable, corrupted or stale cache just means we parse again.
+            # Corrupted pickles can fail with almost any exception, so catch them all
+            pass
+
+    glyphs: HersheyGlyphs = parse_hershey_font(filename)
+
+    if cache:
+        # Only plain data is pickled, so the cache loads the same whether this file is
+        # run as a script or imported as a module.  It is written to a private name
+        # first so concurrent runs never see a partial file
+        tmp_name: str = f"{cache_name}.{os.getpid()}"
+        try:
+            with open(tmp_name, 'wb') as file:
+                pickle.dump((FONT_CACHE_VERSION, signature, glyphs.xs, glyphs.ys, glyphs.penup, glyphs.records),
+                            file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_name, cache_name)
+        except OSError:
+            # A read-only font directory or a full disk just means we parse every time
+            try:
+                os.remove(tmp_name)
+            except OSError:
+                pass
+
     return glyphs
 
 
-def parse_hershey_mapping(filename: str) -> Dict[str, int]:
+def parse_hershey_mapping(filename: str) -> List[int]:
     """
-    Parse a Hershey font ASCII mapping file and return a dictionary.
+    Parse a Hershey font ASCII mapping file and return a table indexed by character code.
 
     The file contains glyph numbers or ranges separated by whitespace,
     starting from ASCII 32 (space character).
@@ -128,9 +304,9 @@ def parse_hershey_mapping(filename: str) -> Dict[str, int]:
         filename (str): Path to the mapping file
 
     Returns:
-        dict: Dictionary where keys are ASCII characters and values are Hershey glyph numbers
+        list: Hershey glyph numbers indexed by character code, -1 for characters without a glyph
     """
-    ascii_to_glyph: Dict[str, int] = {}
+    table: List[int] = [-1] * 128
 
     with open(filename, 'r') as file:
         content: str = file.read()
@@ -146,38 +322,190 @@ def parse_hershey_mapping(filename: str) -> Dict[str, int]:
             start_str, end_str = token.split('-')
             start_num: int = int(start_str)
             end_num: int = int(end_str)
-
-            # Assign consecutive glyph numbers to consecutive ASCII codes
-            for glyph_num in range(start_num, end_num + 1):
-                ascii_to_glyph[chr(ascii_code)] = glyph_num
-                ascii_code += 1
+            glyph_nums: range = range(start_num, end_num + 1)
         else:
             # Handle individual number
             try:
-                glyph_num = int(token)
-                ascii_to_glyph[chr(ascii_code)] = glyph_num
-                ascii_code += 1
+                glyph_num: int = int(token)
+                glyph_nums = range(glyph_num, glyph_num + 1)
             except ValueError:
                 # Skip invalid tokens
                 print(f"Warning: Skipping invalid token: {token}")
                 continue
 
-    return ascii_to_glyph
+        # Assign consecutive glyph numbers to consecutive ASCII codes
+        for glyph_num in glyph_nums:
+            if ascii_code >= len(table):
+                table.extend([-1] * len(table))
+            table[ascii_code] = glyph_num
+            ascii_code += 1
+
+    return table
+
+
+def load_hershey_mapping(filename: str) -> List[int]:
+    """
+    Load a Hershey font ASCII mapping file, reusing the table from an earlier load of
+    the same unchanged file.  The table is shared, so it must not be modified.
+
+    Args:
+        filename (str): Path to the mapping file
+
+    Returns:
+        list: Table as returned by parse_hershey_mapping()
+    """
+    return cached_hershey_mapping(os.path.abspath(filename), file_signature(filename))
+
+
+@functools.lru_cache(maxsize=4)
+def cached_hershey_mapping(filename: str, signature: Tuple[int, int]) -> List[int]:
+    """
+    Memoized body of load_hershey_mapping(), keyed by the mapping file signature.
+    """
+    return parse_hershey_mapping(filename)
+
+
+def text_glyphs(text: str, mapping: List[int]) -> Set[int]:
+    """
+    Return the glyph numbers needed to render a string.
+
+    Args:
+        text (str): Text to be rendered
+        mapping (list): Table from parse_hershey_mapping()
+
+    Returns:
+        set: Glyph numbers used by the characters of text that have a mapping
+    """
+    return {mapping[code] for code in map(ord, set(text)) if code < len(mapping) and mapping[code] >= 0}
+
+
+def glyph_polylines(glyph: Dict[str, object], x: int, y: int) -> List[List[List[int]]]:
+    """
+    Convert a glyph into polylines, one for each stroke between pen up operations.
+
+    Glyph coordinates have y pointing down, the polylines have y pointing up with
+    the glyph origin placed at (x, -y).
+
+    Args:
+        glyph (dict): Glyph definition from parse_hershey_font()
+        x (int): Horizontal position of the glyph origin
+        y (int): Vertical position of the glyph origin, measured downwards
+
+    Returns:
+        list: List of polylines, each a list of [x, y] points
+    """
+    xs: np.ndarray = cast(np.ndarray, glyph["xs"])
+    ys: np.ndarray = cast(np.ndarray, glyph["ys"])
+    penup: np.ndarray = cast(np.ndarray, glyph["penup"])
+
+    # Move the whole glyph into place at once
+    world: np.ndarray = np.empty((len(xs), 2), dtype=np.int32)
+    world[:, 0] = xs
+    world[:, 0] += x
+    world[:, 1] = ys
+    world[:, 1] *= -1
+    world[:, 1] -= y
+
+    plines: List[List[List[int]]] = []
+    for i, stroke in enumerate(np.split(world, np.flatnonzero(penup))):
+        if i > 0:
+            stroke = stroke[1:]  # Every stroke after the first starts with its pen up row
+        if len(stroke):
+            plines.append(stroke.tolist())
+
+    return plines
+
+
+def layout_text(text: str, glyphs: HersheyGlyphs, mapping: List[int]) -> List[Tuple[str, int, int]]:
+    """
+    Work out where each character of a string goes.
+
+    Args:
+        text (str): Text to lay out
+        glyphs (HersheyGlyphs): Glyph definitions from parse_hershey_font()
+        mapping (list): Table from parse_hershey_mapping()
+
+    Returns:
+        list: (character, glyph number, x position of the glyph origin) for every
+        character of text, with a glyph number of -1 for characters without a glyph
+    """
+    placed: List[Tuple[str, int, int]] = []
+    x: int = 0
+    for ch in text:
+        code: int = ord(ch)
+        g: int = mapping[code] if code < len(mapping) else -1
+        if g >= 0 and g in glyphs:
+            left, right, _, _ = glyphs.record(g)
+            x = x - left
+            placed.append((ch, g, x))
+            x += right
+        else:
+            placed.append((ch, -1, x))
+
+    return placed
+
+
+def text_polylines(glyphs: HersheyGlyphs, placed: List[Tuple[str, int, int]]) -> List[List[List[int]]]:
+    """
+    Convert a laid out string into polylines, transforming all of its glyphs at once.
+
+    The coordinates of every glyph used are gathered from the shared arrays of
+    glyphs in one go and offset to their positions along the baseline, which is
+    at y = 0 with y pointing up.
 
+    Args:
+        glyphs (HersheyGlyphs): Glyph definitions from parse_hershey_font()
+        placed (list): Layout from layout_text()
 
-def print_mapping_info(mapping: Dict[str, int]) -> None:
+    Returns:
+        list: List of polylines, each a list of [x, y] points, in the order the
+        strokes appear in the text
+    """
+    records: List[GlyphRecord] = [glyphs.record(g) for _, g, _ in placed if g >= 0]
+    if not records:
+        return []
+
+    starts: np.ndarray = np.array([record[2] for record in records], dtype=np.intp)
+    lengths: np.ndarray = np.array([record[3] - record[2] for record in records], dtype=np.intp)
+    positions: np.ndarray = np.array([x for _, g, x in placed if g >= 0], dtype=np.int32)
+
+    # Where each glyph starts in the gathered points, and the row of the shared arrays for each point
+    firsts: np.ndarray = np.cumsum(lengths) - lengths
+    rows: np.ndarray = np.arange(int(lengths.sum())) + np.repeat(starts - firsts, lengths)
+
+    world: np.ndarray = np.empty((len(rows), 2), dtype=np.int32)
+    world[:, 0] = glyphs.xs[rows]
+    world[:, 0] += np.repeat(positions, lengths)
+    world[:, 1] = glyphs.ys[rows]
+    world[:, 1] *= -1
+
+    # A new stroke starts with every glyph and after every pen up, which are then dropped
+    penup: np.ndarray = glyphs.penup[rows]
+    new_stroke: np.ndarray = penup.copy()
+    new_stroke[firsts[lengths > 0]] = True
+    stroke_ids: np.ndarray = np.cumsum(new_stroke)[~penup]
+    world = world[~penup]
+    if not len(world):
+        return []
+
+    return [stroke.tolist() for stroke in np.split(world, np.flatnonzero(np.diff(stroke_ids)) + 1)]
+
+
+def print_mapping_info(mapping: List[int]) -> None:
     """
     Print information about the ASCII to glyph mapping.
 
     Args:
-        mapping (dict): Dictionary from parse_hershey_mapping()
+        mapping (list): Table from parse_hershey_mapping()
     """
-    print(f"Mapping contains {len(mapping)} characters")
-    print(f"ASCII range: {ord(min(mapping.keys()))} to {ord(max(mapping.keys()))}")
-    print(f"Character range: '{min(mapping.keys())}' to '{max(mapping.keys())}'")
+    mapped: List[Tuple[str, int]] = [(chr(code), glyph) for code, glyph in enumerate(mapping) if glyph >= 0]
+
+    print(f"Mapping contains {len(mapped)} characters")
+    print(f"ASCII range: {ord(mapped[0][0])} to {ord(mapped[-1][0])}")
+    print(f"Character range: '{mapped[0][0]}' to '{mapped[-1][0]}'")
 
     print("\nFirst 10 mappings:")
-    for i, (char, glyph) in enumerate(sorted(mapping.items())[:10]):
+    for char, glyph in mapped[:10]:
         ascii_val: int = ord(char)
         char_display: str = repr(char) if char.isprintable() and char != ' ' else f"ASCII {ascii_val}"
         print(f"  {char_display} -> glyph {glyph}")
@@ -185,64 +513,215 @@ def print_mapping_info(mapping: Dict[str, int]) -> None:
     print("\nSample letter mappings:")
     sample_chars: List[str] = ['A', 'B', 'C', 'a', 'b', 'c', '0', '1', '2']
     for char in sample_chars:
-        if char in mapping:
-            print(f"  '{char}' -> glyph {mapping[char]}")
+        if ord(char) < len(mapping) and mapping[ord(char)] >= 0:
+            print(f"  '{char}' -> glyph {mapping[ord(char)]}")
+
+
+class DxfWriter:
+    """
+    Minimal DXF writer that streams polylines straight to a file.
+
+    The file is in the AutoCAD R12 format with only an ENTITIES section, each
+    polyline being a POLYLINE/VERTEX/SEQEND sequence on layer 0.  That is about as
+    small a DXF as readers accept, and nothing is kept in memory while writing.
+
+    Args:
+        filename (str): Path of the DXF file to write
+    """
+
+    def __init__(self, filename: str) -> None:
+        self.file = open(filename, 'w')
+        self.file.write("0\nSECTION\n2\nENTITIES\n")
+
+    def add_polyline(self, points: List[List[int]]) -> None:
+        """
+        Write an open polyline.
+
+        Args:
+            points (list): List of (x, y) points
+        """
+        self.file.write("0\nPOLYLINE\n8\n0\n66\n1\n10\n0.0\n20\n0.0\n30\n0.0\n70\n0\n"
+                        + "".join(f"0\nVERTEX\n8\n0\n10\n{px}\n20\n{py}\n30\n0.0\n" for px, py in points)
+                        + "0\nSEQEND\n8\n0\n")
+
+    def close(self) -> None:
+        """
+        Finish the ENTITIES section and close the file.
+        """
+        self.file.write("0\nENDSEC\n0\nEOF\n")
+        self.file.close()
+
+    def __enter__(self) -> 'DxfWriter':
+        return self
+
+    def __exit__(self, exc_type: Optional[type], exc: Optional[BaseException], tb: object) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            # Don't leave a truncated file behind that looks like a complete DXF
+            self.file.close()
+            os.remove(self.file.name)
 
 
 import ezdxf
 import argparse
+import concurrent.futures
+
+
+def render(text: str, output: str, glyphs: HersheyGlyphs, mapping: List[int],
+           blocks: bool = False, plain: bool = False, verbose: bool = False) -> None:
+    """
+    Render a string with a Hershey font and save it as a DXF file.
+
+    Args:
+        text (str): Text to render
+        output (str): Path of the DXF file to write
+        glyphs (HersheyGlyphs): Glyph definitions from parse_hershey_font() or load_hershey_font()
+        mapping (list): Table from parse_hershey_mapping() or load_hershey_mapping()
+        blocks (bool): Define each glyph once as a block and insert it wherever it is used
+        plain (bool): Write a minimal R12 DXF with DxfWriter instead of using ezdxf,
+            cannot be combined with blocks
+        verbose (bool): Print the glyphs and their coordinates as they are rendered
+
+    Raises:
+        ValueError: If both blocks and plain are set
+    """
+    if blocks and plain:
+        raise ValueError("blocks and plain output cannot be combined")
+
+    placed: List[Tuple[str, int, int]] = layout_text(text, glyphs, mapping)
+
+    if verbose:
+        # Verbose output is collected here and written once per character
+        lines: List[str] = []
+        for ch, g, x in placed:
+            if g >= 0:
+                lines.append(f"# glyph {ch} - {g}")
+                for i, pline in enumerate(glyph_polylines(glyphs[g], x, 0)):
+                    if i > 0:
+                        lines.append("")
+                    lines.extend(f"{px} {py}" for px, py in pline)
+            lines.append("")
+            sys.stdout.write("\n".join(lines) + "\n")
+            lines.clear()
+
+    if plain:
+        plines: List[List[List[int]]] = text_polylines(glyphs, placed)
+        with DxfWriter(output) as writer:
+            for pline in plines:
+                writer.add_polyline(pline)
+        return
+
+    # create a DXF 
+    doc = ezdxf.new("R2010")
+    msp = doc.modelspace()
+
+    if blocks:
+        for ch, g, x in placed:
+            if g >= 0:
+                # Each glyph is defined once and every use of it is just an insert
+                block_name: str = f"HERSHEY_{g}"
+                if block_name not in doc.blocks:
+                    block = doc.blocks.new(name=block_name)
+                    for pline in glyph_polylines(glyphs[g], 0, 0):
+                        block.add_lwpolyline(pline)
+                msp.add_blockref(block_name, (x, 0))
+    else:
+        for pline in text_polylines(glyphs, placed):
+            msp.add_lwpolyline(pline)
+
+    doc.saveas(output)
+
+
+# Font, mapping and render options of a batch worker process, set up by init_worker()
+worker_glyphs: HersheyGlyphs
+worker_mapping: List[int] = []
+worker_options: Dict[str, bool] = {}
+
+
+def init_worker(data: str, font: str, cache: bool, options: Dict[str, bool]) -> None:
+    """
+    Load the font and mapping once for a batch worker process.
+
+    Args:
+        data (str): Path to the Hershey font data file
+        font (str): Path to the mapping file
+        cache (bool): Whether to use the font cache sidecar
+        options (dict): Keyword arguments passed on to render()
+    """
+    global worker_glyphs, worker_mapping, worker_options
+    worker_glyphs = load_hershey_font(data, cache=cache)
+    worker_mapping = load_hershey_mapping(font)
+    worker_options = options
+
+
+def render_job(job: Tuple[str, str]) -> str:
+    """
+    Render one (text, output) pair of a batch in a worker process.
+
+    Returns:
+        str: Path of the DXF file written
+    """
+    text, output = job
+    render(text, output, worker_glyphs, worker_mapping, **worker_options)
+    return output
+
+
+def positive_int(value: str) -> int:
+    """
+    argparse type for options that must be a whole number of at least 1.
+    """
+    number: int = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, not {number}")
+    return number
+
 
 # Example usage:
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Convert text to DXF using Hershey fonts.", formatter_class=argparse.ArgumentDefaultsHelpFormatter)
-    parser.add_argument("text", help="The text to convert to DXF.")
+    parser.add_argument("text", nargs="?", help="The text to convert to DXF.")
     parser.add_argument("-f", "--font", default="mappings/romant.hmp", help="The Hershey font mapping file to use.")
     parser.add_argument("-o", "--output", default="sign.dxf", help="The name of the output DXF file.")
     parser.add_argument("-d", "--data", default="data/hershey_font.dat", help="The path to the Hershey font data file.")
+    output_format = parser.add_mutually_exclusive_group()
+    output_format.add_argument("-b", "--blocks", action="store_true", help="Define each glyph once as a block and insert it wherever it is used.")
+    output_format.add_argument("-p", "--plain", action="store_true", help="Write a minimal R12 DXF directly instead of building it with ezdxf.")
+    parser.add_argument("-B", "--batch", help="Convert each non-empty line of this file to its own DXF file, numbered in order after OUTPUT (sign-1.dxf, sign-2.dxf, ...).")
+    parser.add_argument("-j", "--jobs", type=positive_int, help="Number of processes to use for --batch, the number of CPUs if not given.")
+    parser.add_argument("-n", "--no-cache", action="store_true", help="Do not read or write the parsed font cache.")
     parser.add_argument("-v", "--verbose", action="store_true", help="Print verbose output.")
     args = parser.parse_args()
 
-    # Example of how to use the function
-    glyphs: Dict[int, Dict[str, object]] = parse_hershey_font(args.data)
-    
-    # create a DXF 
-    doc = ezdxf.new("R2010")
-    msp = doc.modelspace()
+    if (args.text is None) == (args.batch is None):
+        parser.error("give either the text to convert or --batch")
+    if args.batch and args.verbose:
+        parser.error("--verbose cannot be used with --batch, the output of the workers would be interleaved")
 
-    x: int = 0
-    y: int = 0
-    last: Optional[Tuple[int, int]] = None
-    pline: List[Tuple[int, int]] = []
-    mapping: Dict[str, int] = parse_hershey_mapping(args.font)
-    for ch in args.text:
-        if ch in mapping:
-            g: int = mapping[ch]
-            if g in glyphs:
-                if args.verbose:
-                    print(f"# glyph {ch} - {g}")
-                glyph: Dict[str, object] = glyphs[g]
-                left: int = cast(int, glyph["left"])
-                right: int = cast(int, glyph["right"])
-                coords: List[Optional[Tuple[int, int]]] = cast(List[Optional[Tuple[int, int]]], glyph["coordinates"])
-                x = x - left 
-                for c in coords:
-                    if c == None:
-                        if len(pline) > 0:
-                            msp.add_lwpolyline(pline)
-                        pline = []
-                        if args.verbose:
-                            print("")
-                        last = None
-                    else:
-                        if args.verbose:
-                            print(f"{x+c[0]} {-y-c[1]}")
-                        last = (x+c[0], -y-c[1])
-                        pline.append(last)
-                x += right
-        if args.verbose:
-            print()
-        if len(pline) > 0:
-            msp.add_lwpolyline(pline)
-        last = None
-        pline = []
-    doc.saveas(args.output)
+    options: Dict[str, bool] = {"blocks": args.blocks, "plain": args.plain, "verbose": args.verbose}
+
+    if args.batch:
+        with open(args.batch, 'r') as file:
+            texts: List[str] = [line.rstrip('\n\r') for line in file if line.strip()]
+
+        stem, ext = os.path.splitext(args.output)
+        jobs: List[Tuple[str, str]] = [(text, f"{stem}-{i}{ext}") for i, text in enumerate(texts, 1)]
+
+        if not args.no_cache:
+            # Parse the font (and write its cache) once here rather than in every worker
+            load_hershey_font(args.data)
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=args.jobs, initializer=init_worker,
+                                                    initargs=(args.data, args.font, not args.no_cache, options)) as pool:
+            # Collect the results so that a failure in any worker is reported here
+            list(pool.map(render_job, jobs))
+    else:
+        mapping: List[int] = load_hershey_mapping(args.font)
+
+        if args.no_cache:
+            # Nothing is saved for later runs, so skip the glyphs this text doesn't use
+            glyphs: HersheyGlyphs = parse_hershey_font(args.data, needed=text_glyphs(args.text, mapping))
+        else:
+            glyphs = load_hershey_font(args.data)
+
+        render(args.text, args.output, glyphs, mapping, **options)